@@ -1,11 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrapper(func):
+            return func
+        return wrapper
+
+
+# The explicit signature makes numba compile eagerly at import (cached on
+# disk after the first run), so the first slider interaction never pays the
+# JIT compile stall.
+@njit(
+    'UniTuple(float32[:], 4)(float32[:], int64, int64, int64, int64, int64)',
+    cache=True, fastmath=True,
+)
+def _indicators_njit(close, rsi_p, short_p, long_p, sig_p, sma_p):
+    # float32 in/out: the plots show two decimal places, and half-width
+    # arrays halve the memory traffic. Running scalars stay float64.
+    n = len(close)
+    rsi = np.empty(n, np.float32)
+    sma = np.empty(n, np.float32)
+    macd = np.empty(n, np.float32)
+    signal = np.empty(n, np.float32)
+
+    delta = np.empty(n, np.float32)
+    delta[0] = 0.0
+    delta[1:] = close[1:] - close[:-1]
+    gain = np.maximum(delta, np.float32(0.0))
+    # max(-d, 0) == max(d, 0) - d, which skips the -delta temporary.
+    loss = gain - delta
+
+    ag = 0.0
+    al = 0.0
+    a_short = 2.0 / (short_p + 1.0)
+    a_long = 2.0 / (long_p + 1.0)
+    a_sig = 2.0 / (sig_p + 1.0)
+    ema_short = close[0]
+    ema_long = close[0]
+    ema_sig = 0.0
+    sma_sum = 0.0
+
+    for i in range(n):
+        if i > 0:
+            ema_short += a_short * (close[i] - ema_short)
+            ema_long += a_long * (close[i] - ema_long)
+        macd[i] = ema_short - ema_long
+        if i == 0:
+            ema_sig = macd[0]
+        else:
+            ema_sig += a_sig * (macd[i] - ema_sig)
+        signal[i] = ema_sig
+
+        if i < rsi_p:
+            # Accumulate the Wilder seed (simple mean of the first rsi_p
+            # changes) while the output is still warming up.
+            ag += gain[i]
+            al += loss[i]
+            rsi[i] = np.nan
+        else:
+            if i == rsi_p:
+                ag = (ag + gain[i]) / rsi_p
+                al = (al + loss[i]) / rsi_p
+            else:
+                ag = (ag * (rsi_p - 1) + gain[i]) / rsi_p
+                al = (al * (rsi_p - 1) + loss[i]) / rsi_p
+            # Equivalent to 100 - 100/(1 + ag/al) but safe when al == 0:
+            # numba raises ZeroDivisionError instead of returning inf.
+            denom = ag + al
+            rsi[i] = 100.0 * ag / denom if denom > 0.0 else np.nan
+
+        # Rolling SMA as a running sum: one add and one subtract per bar.
+        sma_sum += close[i]
+        if i >= sma_p:
+            sma_sum -= close[i - sma_p]
+        if i < sma_p - 1:
+            sma[i] = np.nan
+        else:
+            sma[i] = sma_sum / sma_p
+
+    return rsi, sma, macd, signal
 
 # Style and Layout
-st.markdown(
-    """
+@st.cache_resource
+def _style() -> str:
+    return """
     <style>
         .title {
             font-family: 'Arial', sans-serif;
@@ -47,16 +136,15 @@ st.markdown(
             border-radius: 8px;
         }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+st.markdown(_style(), unsafe_allow_html=True)
 
 # Title
 st.markdown("<h1 class='title'>📊 RSI & Momentum Analysis for Stocks, Treasuries, and ETFs</h1>", unsafe_allow_html=True)
 
 # Sidebar Configuration
 st.sidebar.header("🔧 Customization Options")
-rsi_period = st.sidebar.slider("Select RSI Period", min_value=7, max_value=30, value=14)
 
 instruments = {
     "S&P 500 ETF (SPY)": "SPY",
@@ -70,57 +158,82 @@ instruments = {
     "Crude Oil ETF (USO)": "USO"
 }
 
-selected_instrument = st.sidebar.selectbox("Select a Predefined Instrument", list(instruments.keys()))
-custom_symbol = st.sidebar.text_input("Or Enter Custom Symbol (e.g., MSFT, AAPL, QQQ):", "")
-stock_symbol = custom_symbol if custom_symbol else instruments[selected_instrument]
+# Batch the controls in a form so a typical adjustment session triggers one
+# rerun on Apply instead of one per widget interaction.
+with st.sidebar.form("params"):
+    rsi_period = st.slider("Select RSI Period", min_value=7, max_value=30, value=14)
+    selected_instruments = st.multiselect(
+        "Select Predefined Instruments", list(instruments.keys()), default=[list(instruments.keys())[0]]
+    )
+    custom_symbols = st.text_input("Or Enter Custom Symbols (comma-separated, e.g., MSFT, AAPL, QQQ):", "")
+    st.form_submit_button("Apply")
+
+if custom_symbols:
+    symbols = [s.strip().upper() for s in custom_symbols.split(',') if s.strip()]
+else:
+    symbols = [instruments[name] for name in selected_instruments]
+# Dedupe while preserving order; repeated symbols would render duplicate
+# charts and trip Streamlit's duplicate-element check.
+symbols = list(dict.fromkeys(symbols))
 
 # Function Definitions
-def calculate_rsi(data, period):
-    delta = data['Close'].diff(1)
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=period, min_periods=1).mean()
-    avg_loss = loss.rolling(window=period, min_periods=1).mean()
-
-    avg_gain.iloc[period] = gain.iloc[:period+1].mean()
-    avg_loss.iloc[period] = loss.iloc[:period+1].mean()
-
-    for i in range(period + 1, len(avg_gain)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (period - 1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (period - 1) + loss.iloc[i]) / period
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def calculate_macd(data, short_period=12, long_period=26, signal_period=9):
-    short_ema = data['Close'].ewm(span=short_period, adjust=False).mean()
-    long_ema = data['Close'].ewm(span=long_period, adjust=False).mean()
-    macd = short_ema - long_ema
-    signal = macd.ewm(span=signal_period, adjust=False).mean()
-    return macd, signal
-
-def calculate_sma(data, period=20):
-    return data['Close'].rolling(window=period).mean()
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    # Deferred so the landing page never pays yfinance's import cost; the
+    # cache means it is hit at most once per (symbol, period, interval).
+    import yfinance as yf
+
+    return yf.download(
+        symbol, period=period, interval=interval, auto_adjust=True,
+        progress=False, threads=False, multi_level_index=False,
+    )
+
+@st.cache_data
+def _compute_indicators(close, rsi_period, short_period=12, long_period=26, signal_period=9, sma_period=20):
+    # pandas can hand back a read-only view; the eager signature wants a
+    # plain writable C-contiguous array.
+    if not close.flags.writeable:
+        close = close.copy()
+    rsi, sma, macd, signal = _indicators_njit(
+        close, rsi_period, short_period, long_period, signal_period, sma_period
+    )
+    return {'RSI': rsi, 'SMA_20': sma, 'MACD': macd, 'Signal': signal}
+
+def _memo(fn, key, *args):
+    # Session-local memo on top of st.cache_data: the key is a small tuple
+    # of the inputs that actually matter, so a rerun that changes nothing
+    # relevant skips even the cache's array hashing.
+    cache = st.session_state.setdefault("memo", {})
+    if key not in cache:
+        cache[key] = fn(*args)
+    return cache[key]
 
 # Main Logic
-if stock_symbol:
-    stock_data = yf.download(stock_symbol, period='6mo', interval='1d')
+if symbols:
+    # Downloads are HTTP-latency bound; fetch all symbols concurrently
+    # (workers release the GIL during socket IO, and _fetch stays cached).
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        frames = dict(zip(symbols, ex.map(lambda s: _fetch(s, '6mo', '1d'), symbols)))
+
+    for stock_symbol in symbols:
+        stock_data = frames[stock_symbol]
 
-    if stock_data.empty:
-        st.error(f"⚠️ No data fetched for symbol: {stock_symbol}. Please check the symbol or try another one.")
-    else:
-        # Use 'Close' as a fallback for 'Close'
-        if 'Close' not in stock_data.columns:
-            st.warning(f"'Close' column is missing in the data for symbol: {stock_symbol}. Using 'Close' instead.")
-            stock_data['Close'] = stock_data['Close']
+        if stock_data.empty:
+            st.error(f"⚠️ No data fetched for symbol: {stock_symbol}. Please check the symbol or try another one.")
+            continue
 
         # Perform Calculations
-        stock_data['RSI'] = calculate_rsi(stock_data, rsi_period)
-        stock_data['SMA_20'] = calculate_sma(stock_data)
-        stock_data['MACD'], stock_data['Signal'] = calculate_macd(stock_data)
+        close = stock_data['Close'].to_numpy(dtype=np.float32)
+        indicators = _memo(
+            _compute_indicators,
+            (stock_symbol, rsi_period, len(stock_data), float(close[-1])),
+            close, rsi_period,
+        )
+        # One assign call inserts all four columns in a single
+        # BlockManager pass instead of four copy-triggering inserts.
+        stock_data = stock_data.assign(**indicators)
 
-        current_rsi = stock_data['RSI'].iloc[-1]
+        current_rsi = float(indicators['RSI'][-1])
         rsi_status = "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral"
 
         rsi_status_color = "#e74c3c" if rsi_status == "Overbought" else "#2ecc71" if rsi_status == "Oversold" else "#f39c12"
@@ -136,27 +249,32 @@ if stock_symbol:
 
         st.subheader(f"🔍 Insights for {stock_symbol}")
 
-        # RSI Plot
-        fig_rsi = go.Figure()
-        fig_rsi.add_trace(go.Scatter(x=stock_data.index, y=stock_data['RSI'], mode='lines', name='RSI'))
-        fig_rsi.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought", annotation_position="bottom right")
-        fig_rsi.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold", annotation_position="top right")
-        fig_rsi.update_layout(title=f"{stock_symbol} RSI (Default Period: {rsi_period})", yaxis_title="RSI Value")
-        st.plotly_chart(fig_rsi)
-
-        # MACD Plot
-        fig_macd = go.Figure()
-        fig_macd.add_trace(go.Scatter(x=stock_data.index, y=stock_data['MACD'], mode='lines', name='MACD', line=dict(color='purple')))
-        fig_macd.add_trace(go.Scatter(x=stock_data.index, y=stock_data['Signal'], mode='lines', name='Signal Line', line=dict(color='orange')))
-        fig_macd.update_layout(title=f"{stock_symbol} MACD", yaxis_title="MACD Value")
-        st.plotly_chart(fig_macd)
-
-        # Price & SMA Plot
-        fig_price = go.Figure()
-        fig_price.add_trace(go.Scatter(x=stock_data.index, y=stock_data['Close'], mode='lines', name='Price', line=dict(color='black')))
-        fig_price.add_trace(go.Scatter(x=stock_data.index, y=stock_data['SMA_20'], mode='lines', name='20-day SMA', line=dict(color='red')))
-        fig_price.update_layout(title=f"{stock_symbol} Price and 20-day SMA", yaxis_title="Price")
-        st.plotly_chart(fig_price)
+        # Plotly's array serializer fast-path wants plain ndarrays, not
+        # pandas index/Series objects.
+        x_arr = stock_data.index.to_numpy()
+
+        # One figure, three linked rows: RSI, MACD, price + SMA.
+        fig = make_subplots(
+            rows=3, cols=1, shared_xaxes=True, row_heights=[0.25, 0.25, 0.5],
+            vertical_spacing=0.06,
+            subplot_titles=(
+                f"{stock_symbol} RSI (Period: {rsi_period})",
+                f"{stock_symbol} MACD",
+                f"{stock_symbol} Price and 20-day SMA",
+            ),
+        )
+        fig.add_trace(go.Scattergl(x=x_arr, y=indicators['RSI'], mode='lines', name='RSI'), row=1, col=1)
+        fig.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought", annotation_position="bottom right", row=1, col=1)
+        fig.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold", annotation_position="top right", row=1, col=1)
+        fig.add_trace(go.Scattergl(x=x_arr, y=indicators['MACD'], mode='lines', name='MACD', line=dict(color='purple')), row=2, col=1)
+        fig.add_trace(go.Scattergl(x=x_arr, y=indicators['Signal'], mode='lines', name='Signal Line', line=dict(color='orange')), row=2, col=1)
+        fig.add_trace(go.Scattergl(x=x_arr, y=close, mode='lines', name='Price', line=dict(color='black')), row=3, col=1)
+        fig.add_trace(go.Scattergl(x=x_arr, y=indicators['SMA_20'], mode='lines', name='20-day SMA', line=dict(color='red')), row=3, col=1)
+        fig.update_yaxes(title_text="RSI Value", row=1, col=1)
+        fig.update_yaxes(title_text="MACD Value", row=2, col=1)
+        fig.update_yaxes(title_text="Price", row=3, col=1)
+        fig.update_layout(height=800, uirevision='fixed')
+        st.plotly_chart(fig, use_container_width=True, key=f"chart_{stock_symbol}")
 
         # Alerts
         if rsi_status == "Overbought":